@@ -37,25 +37,33 @@ class MeanReversionSpyRsiKr(QCAlgorithm):
         # --- Data Subscription ---
         self.spy = self.AddEquity("SPY", Resolution.Daily)
         self.spy.SetDataNormalizationMode(DataNormalizationMode.Raw) # Or adjust as needed
+        self._spy_symbol = self.spy.Symbol # Reuse the Symbol object instead of resolving "SPY" on every lookup
 
         # --- Indicator Initialization ---
+        # A single daily consolidator feeds all indicators, instead of one consolidator per indicator
+        self._daily_consolidator = self.ResolveConsolidator(self._spy_symbol, Resolution.Daily)
+
         # Standard Indicators
         self.rsi_period = 14
         self.atr_period = 14
-        self.rsi = self.RSI("SPY", self.rsi_period, MovingAverageType.Simple, Resolution.Daily)
-        self.atr = self.ATR("SPY", self.atr_period, MovingAverageType.Simple, Resolution.Daily)
+        self.rsi = RelativeStrengthIndex(self.rsi_period, MovingAverageType.Simple)
+        self.atr = AverageTrueRange(self.atr_period, MovingAverageType.Simple)
+        self.RegisterIndicator(self._spy_symbol, self.rsi, self._daily_consolidator)
+        self.RegisterIndicator(self._spy_symbol, self.atr, self._daily_consolidator)
 
         # Custom Kernel Regression Indicator
         self.kr_period = 80  # Lookback L
         self.kr_bandwidth = 15 # Bandwidth h
         self.kr = KernelRegression(f"KR({self.kr_period},{self.kr_bandwidth})", self.kr_period, self.kr_bandwidth)
         # Register the custom indicator to receive data from SPY
-        self.RegisterIndicator("SPY", self.kr, Resolution.Daily, Field.Close) # Use Close price for KR
+        self.RegisterIndicator(self._spy_symbol, self.kr, self._daily_consolidator, Field.Close) # Use Close price for KR
 
         # --- Warm-up Period ---
-        # Set warm-up period to ensure all indicators are ready before trading.
-        # The longest period is KR (80), plus potentially a small buffer.
-        self.SetWarmUp(timedelta(days=self.kr_period + 5)) # Add a buffer
+        # Warm up all indicators from a single history request so they are ready before trading.
+        # The longest period is KR (80). LEAN blocks history requests past the current time, so the
+        # indicators cannot be precomputed for the whole backtest; priming them here instead of using
+        # SetWarmUp avoids replaying the warm-up bars through the engine and OnData.
+        self.WarmUpIndicators(self.kr_period)
 
         # --- Strategy Parameters ---
         self.rsi_oversold = 30
@@ -65,10 +73,52 @@ class MeanReversionSpyRsiKr(QCAlgorithm):
         self.atr_profit_multiplier = 3.0
         self.portfolio_allocation = 0.95 # Allocate 95% to each trade
 
+        # --- Logging ---
+        # Routine trade logs are only formatted and sent to the engine when the "debug" parameter is "1".
+        # Warnings and errors are always logged.
+        self._debug = self.GetParameter("debug", "0") == "1"
+
         # --- Tracking ---
         self.entry_price = 0.0
         self.stop_loss_order_ticket = None
         self.profit_target_order_ticket = None
+        self._ticket_handlers = {} # SL/PT order id -> fill handler, see OnOrderEvent
+        # SL/PT parameters of the entry order in flight, see SetPendingEntry (sign 0 when there is none)
+        self._pending_sign = 0.0
+        self._pending_sl_offset = 0.0
+        self._pending_pt_offset = 0.0
+        # Python-side mirrors of the SL/PT tickets' active state, so exits don't query Status.IsActive()
+        self._sl_active = False
+        self._pt_active = False
+
+        # --- Enum Constants ---
+        # Order enums as plain ints, so OnOrderEvent compares Python ints instead of .NET enum values
+        self._ot_market = int(OrderType.Market)
+        self._od_buy = int(OrderDirection.Buy)
+        self._od_sell = int(OrderDirection.Sell)
+        self._os_filled = int(OrderStatus.Filled)
+        self._os_canceled = int(OrderStatus.Canceled)
+        self._os_invalid = int(OrderStatus.Invalid)
+        self._os_cancel_pending = int(OrderStatus.CancelPending)
+        self._os_errors = (self._os_invalid, self._os_cancel_pending, int(OrderStatus.Error))
+
+
+    def WarmUpIndicators(self, bar_count):
+        """
+        Primes RSI, ATR and KR with the last 'bar_count' daily bars.
+        Args:
+            bar_count: The number of historical daily bars to request.
+        """
+        history = list(self.History[TradeBar](self._spy_symbol, bar_count, Resolution.Daily))
+        if not history:
+            self.Log(f"{self.Time} >> WARNING: No history available to warm up indicators.")
+            return
+
+        for bar in history:
+            self.rsi.Update(bar.EndTime, bar.Close)
+            self.atr.Update(bar)
+        # KR consumes the closes in one vectorized pass
+        self.kr.warmup([float(bar.Close) for bar in history], history[-1].EndTime)
 
 
     def OnData(self, data):
@@ -81,54 +131,65 @@ class MeanReversionSpyRsiKr(QCAlgorithm):
         if self.IsWarmingUp:
             return
 
-        # Check if SPY data is present
-        if not data.ContainsKey("SPY") or data["SPY"] is None:
-             return
+        # Check if SPY data is present (single lookup on the slice)
+        bar = data.Bars.get(self._spy_symbol)
+        if bar is None:
+            return
 
         # Check if all indicators are ready
         if not self.rsi.IsReady or not self.atr.IsReady or not self.kr.IsReady:
             return
 
         # Get indicator values
+        # Read each value across the Python/.NET boundary once and work with locals from here on
         current_rsi = self.rsi.Current.Value
         current_atr = self.atr.Current.Value
         current_kr = self.kr.Current.Value # Access the calculated KR value
-        current_price = data["SPY"].Close
+        current_price = bar.Close
+        rsi_oversold = self.rsi_oversold
+        rsi_overbought = self.rsi_overbought
+        rsi_exit_level = self.rsi_exit_level
 
         # --- Trading Logic ---
 
         # Check if we have an existing position
-        position = self.Portfolio["SPY"]
+        position = self.Portfolio[self._spy_symbol]
         if not position.Invested:
             # --- Entry Logic ---
             # Check Long condition: RSI < 30 AND Close < KR
-            if current_rsi < self.rsi_oversold and current_price < current_kr:
-                self.Log(f"{self.Time} >> ENTRY SIGNAL: Long. RSI={current_rsi:.2f}, Close={current_price:.2f}, KR={current_kr:.2f}")
+            if current_rsi < rsi_oversold and current_price < current_kr:
+                if self._debug:
+                    self.Log(f"{self.Time} >> ENTRY SIGNAL: Long. RSI={current_rsi:.2f}, Close={current_price:.2f}, KR={current_kr:.2f}")
                 # Calculate order size
-                quantity = self.CalculateOrderQuantity("SPY", self.portfolio_allocation)
+                quantity = self.CalculateOrderQuantity(self._spy_symbol, self.portfolio_allocation)
                 if quantity != 0:
-                    self.MarketOrder("SPY", quantity, asynchronous=True) # Place async market order
+                    self.SetPendingEntry(1.0, current_atr)
+                    self.MarketOrder(self._spy_symbol, quantity, asynchronous=True) # Place async market order
                     # SL/PT will be placed in OnOrderEvent upon fill confirmation
 
             # Check Short condition: RSI > 70 AND Close > KR
-            elif current_rsi > self.rsi_overbought and current_price > current_kr:
-                self.Log(f"{self.Time} >> ENTRY SIGNAL: Short. RSI={current_rsi:.2f}, Close={current_price:.2f}, KR={current_kr:.2f}")
+            elif current_rsi > rsi_overbought and current_price > current_kr:
+                if self._debug:
+                    self.Log(f"{self.Time} >> ENTRY SIGNAL: Short. RSI={current_rsi:.2f}, Close={current_price:.2f}, KR={current_kr:.2f}")
                 # Calculate order size (negative for short)
-                quantity = self.CalculateOrderQuantity("SPY", -self.portfolio_allocation)
+                quantity = self.CalculateOrderQuantity(self._spy_symbol, -self.portfolio_allocation)
                 if quantity != 0:
-                    self.MarketOrder("SPY", quantity, asynchronous=True) # Place async market order
+                    self.SetPendingEntry(-1.0, current_atr)
+                    self.MarketOrder(self._spy_symbol, quantity, asynchronous=True) # Place async market order
                     # SL/PT will be placed in OnOrderEvent upon fill confirmation
 
         else: # We are invested
             # --- Exit Logic ---
             # Check RSI exit condition first (overrides SL/PT if triggered)
-            if position.IsLong and current_rsi > self.rsi_exit_level:
-                self.Log(f"{self.Time} >> EXIT SIGNAL: RSI Exit Long. RSI={current_rsi:.2f}")
-                self.Liquidate("SPY", "RSI Exit")
+            if position.IsLong and current_rsi > rsi_exit_level:
+                if self._debug:
+                    self.Log(f"{self.Time} >> EXIT SIGNAL: RSI Exit Long. RSI={current_rsi:.2f}")
+                self.Liquidate(self._spy_symbol, "RSI Exit")
                 self.CancelStopLossAndProfitTarget() # Ensure SL/PT are cancelled
-            elif position.IsShort and current_rsi < self.rsi_exit_level:
-                self.Log(f"{self.Time} >> EXIT SIGNAL: RSI Exit Short. RSI={current_rsi:.2f}")
-                self.Liquidate("SPY", "RSI Exit")
+            elif position.IsShort and current_rsi < rsi_exit_level:
+                if self._debug:
+                    self.Log(f"{self.Time} >> EXIT SIGNAL: RSI Exit Short. RSI={current_rsi:.2f}")
+                self.Liquidate(self._spy_symbol, "RSI Exit")
                 self.CancelStopLossAndProfitTarget() # Ensure SL/PT are cancelled
 
             # Note: The SL/PT orders placed via PlaceStopLossAndProfitTarget will be handled
@@ -136,126 +197,184 @@ class MeanReversionSpyRsiKr(QCAlgorithm):
             # unless we were manually managing stops with market orders based on price crossing levels.
 
 
+    def SetPendingEntry(self, sign, current_atr):
+        """
+        Stores the SL/PT parameters of an entry order at submission time, so the fill only has to apply them.
+        Args:
+            sign: +1.0 for a long entry, -1.0 for a short entry.
+            current_atr: The ATR value at signal time.
+        """
+        self._pending_sign = sign
+        self._pending_sl_offset = self.atr_stop_multiplier * current_atr
+        self._pending_pt_offset = self.atr_profit_multiplier * current_atr
+
+
     def OnOrderEvent(self, orderEvent):
         """
         Event handler for order status changes. Crucial for placing SL/PT after entry fill.
         Args:
             orderEvent: The order event object containing details about the order status change.
         """
-        order = self.Transactions.GetOrderById(orderEvent.OrderId)
+        # Read the event fields once; the checks below reuse these locals
+        oid = orderEvent.OrderId
+        status = int(orderEvent.Status)
+
+        if status == self._os_filled:
+            # SL/PT fills are dispatched straight to their handler by order id
+            handler = self._ticket_handlers.get(oid)
+            if handler is not None:
+                handler(orderEvent)
+                return
 
-        # Log fills and place SL/PT for entry orders
-        if orderEvent.Status == OrderStatus.Filled:
             # Check if it's an entry fill (market order for SPY, and we are not currently tracking SL/PT)
-            if order.Symbol == self.spy.Symbol and order.Type == OrderType.Market and \
-               self.stop_loss_order_ticket is None and self.profit_target_order_ticket is None:
-
-                # Check if the fill actually resulted in a position matching the order direction
-                # (Handles cases where fills might be partial or delayed)
-                position = self.Portfolio["SPY"]
-                if (order.Direction == OrderDirection.Buy and position.IsLong) or \
-                   (order.Direction == OrderDirection.Sell and position.IsShort):
-
-                    self.entry_price = orderEvent.FillPrice
-                    fill_quantity = orderEvent.AbsoluteFillQuantity # Use actual filled quantity
-                    self.Log(f"{self.Time} >> ENTRY FILL: {order.Direction} {fill_quantity} SPY @ {self.entry_price:.2f}")
-
-                    # Place SL and PT orders now that we have the fill price and quantity
-                    # Ensure ATR is ready before using its value
-                    if self.atr.IsReady:
-                        current_atr = self.atr.Current.Value
-                        self.PlaceStopLossAndProfitTarget(order.Direction, fill_quantity, self.entry_price, current_atr)
-                    else:
-                        self.Log(f"{self.Time} >> WARNING: ATR not ready at time of fill. Cannot place SL/PT for OrderId {orderEvent.OrderId}.")
-                        # Liquidate immediately if we can't set SL/PT? Or handle differently?
-                        self.Liquidate("SPY", "ATR Not Ready on Fill") # Safer to liquidate if SL/PT cannot be set
-
-            # Check if a SL or PT order was filled
-            elif self.stop_loss_order_ticket is not None and orderEvent.OrderId == self.stop_loss_order_ticket.OrderId:
-                self.Log(f"{self.Time} >> STOP LOSS FILLED: OrderId {orderEvent.OrderId} @ {orderEvent.FillPrice:.2f}")
-                if self.profit_target_order_ticket is not None:
-                    self.profit_target_order_ticket.Cancel("Stop Loss Hit")
-                self.ResetTradeTracking() # Reset tracking variables
-
-            elif self.profit_target_order_ticket is not None and orderEvent.OrderId == self.profit_target_order_ticket.OrderId:
-                self.Log(f"{self.Time} >> PROFIT TARGET FILLED: OrderId {orderEvent.OrderId} @ {orderEvent.FillPrice:.2f}")
-                if self.stop_loss_order_ticket is not None:
-                    self.stop_loss_order_ticket.Cancel("Profit Target Hit")
-                self.ResetTradeTracking() # Reset tracking variables
+            if self.stop_loss_order_ticket is not None or self.profit_target_order_ticket is not None:
+                return
+            order = self.Transactions.GetOrderById(oid)
+            if order.Symbol != self._spy_symbol or int(order.Type) != self._ot_market:
+                return
+
+            # Check if the fill actually resulted in a position matching the order direction
+            # (Handles cases where fills might be partial or delayed)
+            direction = order.Direction
+            direction_value = int(direction)
+            position = self.Portfolio[self._spy_symbol]
+            if (direction_value == self._od_buy and position.IsLong) or \
+               (direction_value == self._od_sell and position.IsShort):
+
+                self.entry_price = orderEvent.FillPrice
+                fill_quantity = orderEvent.AbsoluteFillQuantity # Use actual filled quantity
+                if self._debug:
+                    self.Log(f"{self.Time} >> ENTRY FILL: {direction} {fill_quantity} SPY @ {self.entry_price:.2f}")
+
+                # Place SL and PT orders now that we have the fill price and quantity,
+                # using the offsets computed when the entry order was submitted
+                if self._pending_sign != 0.0:
+                    self.PlaceStopLossAndProfitTarget(fill_quantity, self.entry_price)
+                else:
+                    self.Log(f"{self.Time} >> WARNING: No pending SL/PT parameters at time of fill. Cannot place SL/PT for OrderId {oid}.")
+                    # Liquidate immediately if we can't set SL/PT? Or handle differently?
+                    self.Liquidate(self._spy_symbol, "No SL/PT on Fill") # Safer to liquidate if SL/PT cannot be set
 
         # Handle cancellations (including those triggered by Liquidate or manually)
-        elif orderEvent.Status == OrderStatus.Canceled:
-             if self.stop_loss_order_ticket is not None and orderEvent.OrderId == self.stop_loss_order_ticket.OrderId:
-                 self.Log(f"{self.Time} >> Stop Loss Order Canceled: {orderEvent.OrderId}")
+        elif status == self._os_canceled:
+             slt = self.stop_loss_order_ticket
+             ptt = self.profit_target_order_ticket
+             if slt is not None and oid == slt.OrderId:
+                 if self._debug:
+                     self.Log(f"{self.Time} >> Stop Loss Order Canceled: {oid}")
                  self.stop_loss_order_ticket = None
-             if self.profit_target_order_ticket is not None and orderEvent.OrderId == self.profit_target_order_ticket.OrderId:
-                 self.Log(f"{self.Time} >> Profit Target Order Canceled: {orderEvent.OrderId}")
+                 self._sl_active = False
+                 self._ticket_handlers.pop(oid, None)
+             if ptt is not None and oid == ptt.OrderId:
+                 if self._debug:
+                     self.Log(f"{self.Time} >> Profit Target Order Canceled: {oid}")
                  self.profit_target_order_ticket = None
+                 self._pt_active = False
+                 self._ticket_handlers.pop(oid, None)
              # If the cancellation means we are flat, reset tracking
-             if not self.Portfolio["SPY"].Invested:
+             if not self.Portfolio[self._spy_symbol].Invested:
                  self.ResetTradeTracking()
 
         # Log other statuses like errors or invalid for debugging
-        elif orderEvent.Status in [OrderStatus.Invalid, OrderStatus.CancelPending, OrderStatus.Error]:
+        elif status in self._os_errors:
             self.Log(f"{self.Time} >> ORDER EVENT {orderEvent.Status}: {orderEvent.ToString()}")
+            # A rejected SL/PT order is no longer active
+            if status != self._os_cancel_pending:
+                if self.stop_loss_order_ticket is not None and oid == self.stop_loss_order_ticket.OrderId:
+                    self._sl_active = False
+                if self.profit_target_order_ticket is not None and oid == self.profit_target_order_ticket.OrderId:
+                    self._pt_active = False
             # If an entry order fails, reset tracking if necessary
-            if order.Type == OrderType.Market and not self.Portfolio["SPY"].Invested:
+            order = self.Transactions.GetOrderById(oid)
+            if int(order.Type) == self._ot_market and not self.Portfolio[self._spy_symbol].Invested:
                  self.ResetTradeTracking()
 
 
-    def PlaceStopLossAndProfitTarget(self, direction, quantity, entry_price, current_atr):
+    def HandleStopLossFill(self, orderEvent):
+        """ Handles the fill of the SL order: cancels the PT order and resets trade tracking. """
+        if self._debug:
+            self.Log(f"{self.Time} >> STOP LOSS FILLED: OrderId {orderEvent.OrderId} @ {orderEvent.FillPrice:.2f}")
+        self._sl_active = False
+        if self._pt_active:
+            self.profit_target_order_ticket.Cancel("Stop Loss Hit")
+            self._pt_active = False
+        self.ResetTradeTracking() # Reset tracking variables
+
+
+    def HandleProfitTargetFill(self, orderEvent):
+        """ Handles the fill of the PT order: cancels the SL order and resets trade tracking. """
+        if self._debug:
+            self.Log(f"{self.Time} >> PROFIT TARGET FILLED: OrderId {orderEvent.OrderId} @ {orderEvent.FillPrice:.2f}")
+        self._pt_active = False
+        if self._sl_active:
+            self.stop_loss_order_ticket.Cancel("Profit Target Hit")
+            self._sl_active = False
+        self.ResetTradeTracking() # Reset tracking variables
+
+
+    def PlaceStopLossAndProfitTarget(self, quantity, entry_price):
         """
         Places the ATR-based Stop Loss and Profit Target orders after an entry fill.
+        The direction and the ATR offsets were stored by SetPendingEntry when the entry was submitted.
         Args:
-            direction: The direction of the trade (OrderDirection.Buy or OrderDirection.Sell).
             quantity: The absolute quantity filled for the entry.
             entry_price: The average fill price of the entry order.
-            current_atr: The current ATR value to calculate stops/targets.
         """
-        if current_atr <= 0:
-            self.Log(f"{self.Time} >> WARNING: ATR is zero or negative ({current_atr:.2f}), cannot place SL/PT.")
+        # Consume the pending entry parameters: +1 for a long entry, -1 for a short one
+        sign = self._pending_sign
+        stop_offset = self._pending_sl_offset
+        target_offset = self._pending_pt_offset
+        self._pending_sign = 0.0
+
+        if stop_offset <= 0:
+            self.Log(f"{self.Time} >> WARNING: ATR was zero or negative at entry (stop offset {stop_offset:.2f}), cannot place SL/PT.")
             # Consider liquidating if SL/PT cannot be set
-            self.Liquidate("SPY", "Invalid ATR for SL/PT")
+            self.Liquidate(self._spy_symbol, "Invalid ATR for SL/PT")
             return
 
-        self.Log(f"{self.Time} >> Placing SL/PT: Entry={entry_price:.2f}, ATR={current_atr:.2f}, Direction={direction}, Qty={quantity}")
+        if self._debug:
+            self.Log(f"{self.Time} >> Placing SL/PT: Entry={entry_price:.2f}, SL offset={stop_offset:.2f}, PT offset={target_offset:.2f}, Sign={sign:+.0f}, Qty={quantity}")
 
+        # Long and short only differ in the sign of the offsets
+        stop_price = entry_price - sign * stop_offset
+        target_price = entry_price + sign * target_offset
         # Determine the quantity for the closing orders (opposite sign of entry)
-        close_quantity = -quantity if direction == OrderDirection.Buy else quantity
-
-        if direction == OrderDirection.Buy: # Long position
-            stop_price = entry_price - self.atr_stop_multiplier * current_atr
-            target_price = entry_price + self.atr_profit_multiplier * current_atr
-            # Place Stop Market order for SL
-            self.stop_loss_order_ticket = self.StopMarketOrder("SPY", close_quantity, stop_price, "ATR SL")
-            # Place Limit order for PT
-            self.profit_target_order_ticket = self.LimitOrder("SPY", close_quantity, target_price, "ATR PT")
-            self.Log(f"{self.Time} >> Long SL placed at {stop_price:.2f}, PT at {target_price:.2f}")
-
-        elif direction == OrderDirection.Sell: # Short position
-            stop_price = entry_price + self.atr_stop_multiplier * current_atr
-            target_price = entry_price - self.atr_profit_multiplier * current_atr
-            # Place Stop Market order for SL
-            self.stop_loss_order_ticket = self.StopMarketOrder("SPY", close_quantity, stop_price, "ATR SL")
-            # Place Limit order for PT
-            self.profit_target_order_ticket = self.LimitOrder("SPY", close_quantity, target_price, "ATR PT")
-            self.Log(f"{self.Time} >> Short SL placed at {stop_price:.2f}, PT at {target_price:.2f}")
-
-        # Check if orders were created successfully (tickets are not None)
-        if self.stop_loss_order_ticket is None or self.profit_target_order_ticket is None:
+        close_quantity = -sign * quantity
+
+        # Place Stop Market order for SL
+        self.stop_loss_order_ticket = self.StopMarketOrder(self._spy_symbol, close_quantity, stop_price, "ATR SL")
+        # Place Limit order for PT
+        self.profit_target_order_ticket = self.LimitOrder(self._spy_symbol, close_quantity, target_price, "ATR PT")
+        # Route the fills of both orders straight to their handlers in OnOrderEvent
+        # (order methods always return a ticket, rejections are checked through its status below)
+        self._ticket_handlers[self.stop_loss_order_ticket.OrderId] = self.HandleStopLossFill
+        self._sl_active = True
+        self._ticket_handlers[self.profit_target_order_ticket.OrderId] = self.HandleProfitTargetFill
+        self._pt_active = True
+        if self._debug:
+            self.Log(f"{self.Time} >> {'Long' if sign > 0 else 'Short'} SL placed at {stop_price:.2f}, PT at {target_price:.2f}")
+
+        # Check if orders were created successfully. Resting orders are submitted without waiting for the
+        # brokerage and a rejected submission still returns a ticket, so check the status instead of None.
+        if int(self.stop_loss_order_ticket.Status) == self._os_invalid or \
+           int(self.profit_target_order_ticket.Status) == self._os_invalid:
              self.Log(f"{self.Time} >> ERROR: Failed to create SL or PT order tickets. Liquidating position.")
-             self.Liquidate("SPY", "SL/PT Creation Failed")
+             self.Liquidate(self._spy_symbol, "SL/PT Creation Failed")
              self.ResetTradeTracking()
 
 
     def CancelStopLossAndProfitTarget(self):
         """ Cancels any existing SL or PT orders. """
-        if self.stop_loss_order_ticket is not None and self.stop_loss_order_ticket.Status.IsActive():
+        if self._sl_active:
             self.stop_loss_order_ticket.Cancel("Position Closed Manually")
-            self.Log(f"{self.Time} >> Canceled Stop Loss order.")
-        if self.profit_target_order_ticket is not None and self.profit_target_order_ticket.Status.IsActive():
+            self._sl_active = False
+            if self._debug:
+                self.Log(f"{self.Time} >> Canceled Stop Loss order.")
+        if self._pt_active:
             self.profit_target_order_ticket.Cancel("Position Closed Manually")
-            self.Log(f"{self.Time} >> Canceled Profit Target order.")
+            self._pt_active = False
+            if self._debug:
+                self.Log(f"{self.Time} >> Canceled Profit Target order.")
         # Reset tracking immediately after cancellation attempt
         self.ResetTradeTracking()
 
@@ -265,4 +384,7 @@ class MeanReversionSpyRsiKr(QCAlgorithm):
         self.entry_price = 0.0
         self.stop_loss_order_ticket = None
         self.profit_target_order_ticket = None
+        self._ticket_handlers.clear()
+        self._sl_active = False
+        self._pt_active = False
         # self.Log(f"{self.Time} >> Trade tracking variables reset.") # Optional: for debugging
\ No newline at end of file
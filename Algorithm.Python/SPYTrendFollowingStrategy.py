@@ -12,8 +12,7 @@
 # limitations under the License.
 
 from AlgorithmImports import *
-from datetime import timedelta
-import numpy as np
+from collections import deque
 
 class SPYTrendFollowingStrategy(QCAlgorithm):
     '''
@@ -41,8 +40,12 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         # Set brokerage model
         self.SetBrokerageModel(BrokerageName.InteractiveBrokersBrokerage, AccountType.Margin)
         
-        # Set warm-up period to ensure indicators are ready
-        self.SetWarmUp(200)
+        # Strategy parameters, overridable through the algorithm parameters (see run_sweep.py)
+        self.fast_ema_period = self.GetParameter("fast-ema", 50)
+        self.slow_ema_period = self.GetParameter("slow-ema", 200)
+        self.adx_threshold = self.GetParameter("adx-threshold", 20.0)
+        self.initial_stop_atr_multiplier = self.GetParameter("initial-stop-atr-multiplier", 2.0)
+        self.trailing_stop_atr_multiplier = self.GetParameter("trailing-stop-atr-multiplier", 3.0)
         
         # Add SPY with daily resolution for primary signals
         self.spy = self.AddEquity("SPY", Resolution.Daily)
@@ -54,8 +57,8 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         
         # Initialize indicators
         # Primary trend indicators
-        self.fast_ema = self.EMA(self.spy_symbol, 50, Resolution.Daily)
-        self.slow_ema = self.EMA(self.spy_symbol, 200, Resolution.Daily)
+        self.fast_ema = self.EMA(self.spy_symbol, self.fast_ema_period, Resolution.Daily)
+        self.slow_ema = self.EMA(self.spy_symbol, self.slow_ema_period, Resolution.Daily)
         self.adx = self.ADX(self.spy_symbol, 14, Resolution.Daily)
         
         # Confirmation indicators
@@ -64,24 +67,48 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         
         # Risk management indicators
         self.atr = self.ATR(self.spy_symbol, 14, MovingAverageType.Simple, Resolution.Daily)
-        self.atr_90 = RollingWindow[float](90)  # 90-day ATR window for volatility comparison
+        self.atr_90 = deque(maxlen=90)  # 90-day ATR window for volatility comparison
+        self.atr_90_sum = 0.0  # Running sum of atr_90, so the average is O(1)
+        
+        # Warm up the indicators: backtests prime them from a single history request up front instead of
+        # streaming the warm-up bars through the engine; live trading keeps the regular warm-up
+        warm_up_bars = max(200, self.slow_ema_period)
+        self._offline = not self.LiveMode
+        if self._offline:
+            self.WarmUpIndicators(warm_up_bars)
+        else:
+            self.SetWarmUp(warm_up_bars)
+        
+        # Indicators never become un-ready once ready, so the IsReady checks are cached after they first pass
+        self._atr_ready = False
+        self._indicators_ready = False
         
         # Price tracking
         self.high_since_entry = 0
         self.entry_price = 0
         self.days_since_entry = 0
         self.days_since_new_high = 0
-        self.highest_price_20d = RollingWindow[float](20)  # Track 20-day highs for scaling
+        # Track 20-day highs for scaling: monotonic deque of (bar index, price) with decreasing prices,
+        # so the front is always the 20-day high (amortized O(1) per bar)
+        self.highest_price_20d = deque()
+        self.price_bar_count = 0
         
         # Strategy state variables
         self.is_invested = False
         self.position_size = 0
         self.initial_stop_price = 0
         self.trailing_stop_price = 0
-        self.entry_time = None
         self.strategy_drawdown = 0
         self.peak_value = 0
         self.scaled_in = False
+        # Position adjustments worth less than this (in account currency) are not sent as orders
+        self.min_adjustment_value = 500
+        
+        # Output controls: per-bar charts are sampled every _plot_every bars, and trade logs are only
+        # written when the "verbose" parameter is "1"
+        self._plot_every = 5
+        self._bar_ix = 0
+        self._verbose = self.GetParameter("verbose", "0") == "1"
         
         # Schedule daily update for risk management and position monitoring
         self.Schedule.On(self.DateRules.EveryDay(self.spy_symbol), 
@@ -119,6 +146,22 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         state.AddSeries(Series("DrawdownPct", SeriesType.Line, 1))
         self.AddChart(state)
 
+    def WarmUpIndicators(self, bar_count):
+        '''Primes the SPY indicators with the last bar_count daily bars from one history request'''
+        
+        history = list(self.History[TradeBar](self.spy_symbol, bar_count, Resolution.Daily))
+        if not history:
+            self.Log("WARNING: No history available to warm up indicators.")
+            return
+            
+        for bar in history:
+            self.fast_ema.Update(bar.EndTime, bar.Close)
+            self.slow_ema.Update(bar.EndTime, bar.Close)
+            self.macd.Update(bar.EndTime, bar.Close)
+            self.rsi.Update(bar.EndTime, bar.Close)
+            self.adx.Update(bar)
+            self.atr.Update(bar)
+
     def OnData(self, data):
         '''Main event handler for market data updates'''
         
@@ -130,98 +173,116 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         if not data.ContainsKey(self.spy_symbol) or not data.ContainsKey(self.vix_symbol):
             return
             
+        # Snapshot the prices and indicator values every bar needs once: every read crosses the Python/C#
+        # boundary, so the helpers below receive these plain floats instead of re-fetching them.
+        # The remaining indicators are only read by the charts and the entry check, when they actually run
+        spy_close = float(self.Securities[self.spy_symbol].Close)
+        fast_ema = float(self.fast_ema.Current.Value)
+        slow_ema = float(self.slow_ema.Current.Value)
+        atr_value = float(self.atr.Current.Value)
+            
         # Update rolling windows
-        if self.atr.IsReady:
-            self.atr_90.Add(self.atr.Current.Value)
+        if not self._atr_ready:
+            self._atr_ready = self.atr.IsReady
+        if self._atr_ready:
+            self.UpdateAtrWindow(atr_value)
             
         # Update highest price tracking
-        current_price = self.Securities[self.spy_symbol].Close
-        self.highest_price_20d.Add(current_price)
-        
-        # Update strategy state charts
-        self.Plot("Indicators", "FastEMA", self.fast_ema.Current.Value)
-        self.Plot("Indicators", "SlowEMA", self.slow_ema.Current.Value)
-        self.Plot("Indicators", "ADX", self.adx.Current.Value)
-        self.Plot("Indicators", "RSI", self.rsi.Current.Value)
-        
-        self.Plot("Risk Management", "ATR", self.atr.Current.Value)
-        self.Plot("Risk Management", "VIX", self.Securities[self.vix_symbol].Close)
-        
-        if self.atr_90.IsReady:
-            atr_90_avg = np.mean([self.atr_90[i] for i in range(self.atr_90.Count)])
-            self.Plot("Risk Management", "ATR_90_Avg", atr_90_avg)
-        
-        # Update drawdown tracking
-        current_value = self.Portfolio.TotalPortfolioValue
-        if current_value > self.peak_value:
-            self.peak_value = current_value
-        
-        if self.peak_value > 0:
-            self.strategy_drawdown = (self.peak_value - current_value) / self.peak_value
-            self.Plot("Strategy State", "DrawdownPct", self.strategy_drawdown * 100)
+        self.UpdateHighestPriceWindow(spy_close)
+        
+        # Update strategy state charts, sampled every _plot_every bars
+        plot_bar = self._bar_ix % self._plot_every == 0
+        self._bar_ix += 1
+        if plot_bar:
+            self.Plot("Indicators", "FastEMA", fast_ema)
+            self.Plot("Indicators", "SlowEMA", slow_ema)
+            self.Plot("Indicators", "ADX", self.adx.Current.Value)
+            self.Plot("Indicators", "RSI", self.rsi.Current.Value)
+            
+            self.Plot("Risk Management", "ATR", atr_value)
+            self.Plot("Risk Management", "VIX", self.Securities[self.vix_symbol].Close)
+            
+            if len(self.atr_90) == self.atr_90.maxlen:
+                atr_90_avg = self.atr_90_sum / len(self.atr_90)
+                self.Plot("Risk Management", "ATR_90_Avg", atr_90_avg)
         
         # Check if all indicators are ready
-        if not self.fast_ema.IsReady or not self.slow_ema.IsReady or not self.adx.IsReady or not self.macd.IsReady or not self.rsi.IsReady or not self.atr.IsReady:
-            return
+        if not self._indicators_ready:
+            if self.fast_ema.IsReady and self.slow_ema.IsReady and self.adx.IsReady and self.macd.IsReady and self.rsi.IsReady and self.atr.IsReady:
+                self._indicators_ready = True
+            else:
+                return
             
         # Check for entry conditions if not invested
         if not self.is_invested:
-            self.CheckEntrySignals(data)
+            self.CheckEntrySignals(spy_close, fast_ema, slow_ema, atr_value)
         # Check for exit conditions if invested
         else:
-            self.CheckExitSignals(data)
-            self.UpdateStopLevels(data)
-            self.CheckScalingOpportunity(data)
+            self.CheckExitSignals(spy_close, fast_ema, slow_ema)
+            self.UpdateStopLevels(spy_close, atr_value)
+            self.CheckScalingOpportunity(spy_close)
+
+    def UpdateAtrWindow(self, atr_value):
+        '''Adds an ATR value to the 90-day window, keeping its running sum up to date'''
+        if len(self.atr_90) == self.atr_90.maxlen:
+            self.atr_90_sum -= self.atr_90[0]
+        self.atr_90.append(atr_value)
+        self.atr_90_sum += atr_value
+
+    def UpdateHighestPriceWindow(self, price):
+        '''Adds a price to the monotonic 20-day high window'''
+        index = self.price_bar_count
+        self.price_bar_count += 1
+        # Prices at or below the new one can never be the 20-day high again
+        while self.highest_price_20d and self.highest_price_20d[-1][1] <= price:
+            self.highest_price_20d.pop()
+        self.highest_price_20d.append((index, price))
+        # Drop the high once it is older than 20 bars
+        if self.highest_price_20d[0][0] <= index - 20:
+            self.highest_price_20d.popleft()
 
-    def CheckEntrySignals(self, data):
-        '''Check for entry signals based on strategy rules'''
+    def CheckEntrySignals(self, spy_close, fast_ema, slow_ema, atr_value):
+        '''Check for entry signals based on strategy rules, using the values snapshotted in OnData'''
         
+        # Primary signal requires the fast EMA above the slow one: nothing else matters otherwise,
+        # so return before reading any other indicator (this is most bars in bear/sideways regimes)
+        if fast_ema <= slow_ema:
+            return
+            
         # Skip if we're in a significant drawdown
         if self.strategy_drawdown > 0.15:
-            self.Log("Strategy in significant drawdown (>15%). Skipping new entries.")
+            if self._verbose:
+                self.Log("Strategy in significant drawdown (>15%). Skipping new entries.")
             return
             
-        # Get current indicator values
-        fast_ema = self.fast_ema.Current.Value
-        slow_ema = self.slow_ema.Current.Value
-        adx_value = self.adx.Current.Value
-        macd_value = self.macd.Current.Value
-        macd_signal = self.macd.Signal.Current.Value
-        rsi_value = self.rsi.Current.Value
-        vix_value = self.Securities[self.vix_symbol].Close
-        
-        # Primary signal: EMA crossover
-        ema_crossover = fast_ema > slow_ema and self.fast_ema.Current.Value > self.fast_ema.Previous.Value
+        # Primary signal: EMA crossover (fast EMA above the slow one and rising)
+        ema_crossover = fast_ema > float(self.fast_ema.Previous.Value)
         
         # Trend strength filter
-        strong_trend = adx_value > 20
-        
-        # Confirmation signals
-        macd_confirmation = macd_value > macd_signal
-        rsi_confirmation = rsi_value > 50
+        adx_value = float(self.adx.Current.Value)
+        strong_trend = adx_value > self.adx_threshold
         
         # Check for entry signal
         if ema_crossover and strong_trend:
-            self.Log(f"Entry signal detected: EMA Crossover with ADX = {adx_value:.2f}")
-            
-            # Additional confirmation (optional)
-            if macd_confirmation and rsi_confirmation:
-                self.Log("Confirmation indicators are positive: MACD and RSI confirm trend")
+            if self._verbose:
+                self.Log(f"Entry signal detected: EMA Crossover with ADX = {adx_value:.2f}")
+                
+                # Confirmation signals (optional, informational only)
+                macd_confirmation = self.macd.Current.Value > self.macd.Signal.Current.Value
+                rsi_confirmation = self.rsi.Current.Value > 50
+                if macd_confirmation and rsi_confirmation:
+                    self.Log("Confirmation indicators are positive: MACD and RSI confirm trend")
             
             # Determine position size based on trend strength and volatility
-            position_size = self.CalculatePositionSize(adx_value, vix_value)
+            vix_value = float(self.Securities[self.vix_symbol].Close)
+            position_size = self.CalculatePositionSize(adx_value, vix_value, atr_value)
             
             # Execute entry
-            self.ExecuteEntry(position_size)
+            self.ExecuteEntry(position_size, spy_close, atr_value)
 
-    def CheckExitSignals(self, data):
+    def CheckExitSignals(self, current_price, fast_ema, slow_ema):
         '''Check for exit signals based on strategy rules'''
         
-        # Get current indicator values
-        fast_ema = self.fast_ema.Current.Value
-        slow_ema = self.slow_ema.Current.Value
-        current_price = self.Securities[self.spy_symbol].Close
-        
         # Update tracking variables
         self.days_since_entry += 1
         
@@ -241,71 +302,82 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         
         # Check for exit signals
         if ema_crossover_exit:
-            self.Log("Exit signal: EMA crossover (fast below slow)")
+            if self._verbose:
+                self.Log("Exit signal: EMA crossover (fast below slow)")
             self.ExecuteExit()
         elif max_hold_period_exit:
-            self.Log("Exit signal: Maximum hold period exceeded (90 days)")
+            if self._verbose:
+                self.Log("Exit signal: Maximum hold period exceeded (90 days)")
             self.ExecuteExit()
         elif no_new_high_exit:
-            self.Log("Warning: No new high in 30 days. Reevaluating position.")
+            if self._verbose:
+                self.Log("Warning: No new high in 30 days. Reevaluating position.")
             # Reduce position size by 25% if no new high in 30 days
             if self.position_size > 0:
                 new_position = self.position_size * 0.75
-                self.Log(f"Reducing position from {self.position_size:.2f} to {new_position:.2f} due to lack of momentum")
-                self.SetHoldings(self.spy_symbol, new_position)
-                self.position_size = new_position
+                if self._verbose:
+                    self.Log(f"Reducing position from {self.position_size:.2f} to {new_position:.2f} due to lack of momentum")
+                self.AdjustPosition(new_position)
 
-    def UpdateStopLevels(self, data):
+    def UpdateStopLevels(self, current_price, atr_value):
         '''Update stop loss levels based on ATR and price movement'''
         
         if not self.is_invested:
             return
             
-        current_price = self.Securities[self.spy_symbol].Close
-        atr_value = self.atr.Current.Value
-        
         # Update trailing stop if price moves favorably
         if current_price > self.high_since_entry:
             self.high_since_entry = current_price
-            new_stop = current_price - (3 * atr_value)
+            new_stop = current_price - (self.trailing_stop_atr_multiplier * atr_value)
             
             # Only move stop up, never down
             if new_stop > self.trailing_stop_price:
                 self.trailing_stop_price = new_stop
-                self.Log(f"Trailing stop updated to {self.trailing_stop_price:.2f} (current price: {current_price:.2f})")
+                if self._verbose:
+                    self.Log(f"Trailing stop updated to {self.trailing_stop_price:.2f} (current price: {current_price:.2f})")
                 self.Plot("Risk Management", "StopPrice", self.trailing_stop_price)
         
         # Check if stop is hit
         if current_price < self.trailing_stop_price:
-            self.Log(f"Stop loss triggered at {current_price:.2f} (stop level: {self.trailing_stop_price:.2f})")
+            if self._verbose:
+                self.Log(f"Stop loss triggered at {current_price:.2f} (stop level: {self.trailing_stop_price:.2f})")
             self.ExecuteExit()
 
-    def CheckScalingOpportunity(self, data):
+    def CheckScalingOpportunity(self, current_price):
         '''Check for scaling opportunity based on new 20-day highs'''
         
         if not self.is_invested or self.scaled_in or self.position_size >= 1.0:
             return
             
-        current_price = self.Securities[self.spy_symbol].Close
-        
         # Check if we have enough data
-        if not self.highest_price_20d.IsReady:
+        if self.price_bar_count < 20:
             return
             
-        # Calculate 20-day high
-        high_20d = max([self.highest_price_20d[i] for i in range(self.highest_price_20d.Count)])
+        # 20-day high is the front of the monotonic window
+        high_20d = self.highest_price_20d[0][1]
         
         # Scale in if price makes new 20-day high after entry
         if current_price > high_20d and self.days_since_entry > 5:
             additional_size = 0.1  # Add 10% to position
             new_position = min(1.0, self.position_size + additional_size)
             
-            self.Log(f"Scaling in: Adding {additional_size:.2f} to position (new position size: {new_position:.2f})")
-            self.SetHoldings(self.spy_symbol, new_position)
-            self.position_size = new_position
-            self.scaled_in = True
+            if self._verbose:
+                self.Log(f"Scaling in: Adding {additional_size:.2f} to position (new position size: {new_position:.2f})")
+            if self.AdjustPosition(new_position):
+                self.scaled_in = True
+
+    def AdjustPosition(self, new_position):
+        '''Moves an open position to a new target size, skipping the order if the change is too small to matter'''
+        
+        # position_size is the current holdings target, so the order value follows without asking SetHoldings
+        if abs(new_position - self.position_size) * self.Portfolio.TotalPortfolioValue < self.min_adjustment_value:
+            return False
+            
+        self.SetHoldings(self.spy_symbol, new_position)
+        self.position_size = new_position
+        return True
 
-    def CalculatePositionSize(self, adx_value, vix_value):
+    def CalculatePositionSize(self, adx_value, vix_value, current_atr):
         '''Calculate position size based on trend strength and volatility'''
         
         # Base position size based on ADX
@@ -317,35 +389,34 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         # Adjust for volatility (VIX)
         if vix_value > 30:
             base_position *= 0.5  # Reduce by 50% during high volatility
-            self.Log(f"High volatility detected (VIX = {vix_value:.2f}). Reducing position size.")
+            if self._verbose:
+                self.Log(f"High volatility detected (VIX = {vix_value:.2f}). Reducing position size.")
             
         # Adjust for ATR volatility
-        if self.atr_90.IsReady:
-            atr_90_avg = np.mean([self.atr_90[i] for i in range(self.atr_90.Count)])
-            current_atr = self.atr.Current.Value
+        if len(self.atr_90) == self.atr_90.maxlen:
+            atr_90_avg = self.atr_90_sum / len(self.atr_90)
             
             if current_atr > (2 * atr_90_avg):
                 base_position *= 0.7  # Reduce by 30% if ATR is 2x the 90-day average
-                self.Log(f"Elevated ATR detected (current: {current_atr:.2f}, 90d avg: {atr_90_avg:.2f}). Reducing position size.")
+                if self._verbose:
+                    self.Log(f"Elevated ATR detected (current: {current_atr:.2f}, 90d avg: {atr_90_avg:.2f}). Reducing position size.")
                 
         # Adjust for strategy drawdown
         if self.strategy_drawdown > 0.1:
             base_position *= 0.5  # Reduce by 50% if drawdown exceeds 10%
-            self.Log(f"Strategy in drawdown ({self.strategy_drawdown:.2%}). Reducing position size.")
+            if self._verbose:
+                self.Log(f"Strategy in drawdown ({self.strategy_drawdown:.2%}). Reducing position size.")
             
         return base_position
 
-    def ExecuteEntry(self, position_size):
+    def ExecuteEntry(self, position_size, current_price, atr_value):
         '''Execute entry with proper order type and position sizing'''
         
         if self.is_invested:
             return
             
-        current_price = self.Securities[self.spy_symbol].Close
-        atr_value = self.atr.Current.Value
-        
         # Set initial and trailing stops
-        self.initial_stop_price = current_price - (2 * atr_value)
+        self.initial_stop_price = current_price - (self.initial_stop_atr_multiplier * atr_value)
         self.trailing_stop_price = self.initial_stop_price
         
         # Set entry tracking variables
@@ -353,7 +424,6 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         self.high_since_entry = current_price
         self.days_since_entry = 0
         self.days_since_new_high = 0
-        self.entry_time = self.Time
         self.scaled_in = False
         
         # Execute the order
@@ -361,8 +431,9 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         self.position_size = position_size
         self.is_invested = True
         
-        self.Log(f"Entered SPY position with size {position_size:.2f} at {current_price:.2f}")
-        self.Log(f"Initial stop set at {self.initial_stop_price:.2f} ({(current_price - self.initial_stop_price) / current_price:.2%} below entry)")
+        if self._verbose:
+            self.Log(f"Entered SPY position with size {position_size:.2f} at {current_price:.2f}")
+            self.Log(f"Initial stop set at {self.initial_stop_price:.2f} ({(current_price - self.initial_stop_price) / current_price:.2%} below entry)")
         
         self.Plot("Risk Management", "StopPrice", self.initial_stop_price)
         self.Plot("Strategy State", "PositionSize", position_size * 100)
@@ -381,26 +452,42 @@ class SPYTrendFollowingStrategy(QCAlgorithm):
         self.position_size = 0
         self.initial_stop_price = 0
         self.trailing_stop_price = 0
-        self.entry_time = None
         self.scaled_in = False
         
-        self.Log(f"Exited SPY position at {self.Securities[self.spy_symbol].Close:.2f}")
+        if self._verbose:
+            self.Log(f"Exited SPY position at {self.Securities[self.spy_symbol].Close:.2f}")
         self.Plot("Strategy State", "PositionSize", 0)
         self.Plot("Risk Management", "StopPrice", 0)
 
     def DailyUpdate(self):
         '''Daily update for risk management and position monitoring'''
         
-        if not self.is_invested:
+        if self.IsWarmingUp:
             return
             
-        # Log current position status
-        days_held = (self.Time - self.entry_time).days if self.entry_time else 0
-        current_price = self.Securities[self.spy_symbol].Close
-        pnl_pct = (current_price / self.entry_price - 1) * 100 if self.entry_price > 0 else 0
+        # Update drawdown tracking once a day: the portfolio value is a full holdings revaluation on the
+        # C# side, and on daily bars CheckEntrySignals only needs this day's strategy_drawdown
+        current_value = self.Portfolio.TotalPortfolioValue
+        if current_value > self.peak_value:
+            self.peak_value = current_value
         
-        self.Log(f"Position update: Holding SPY for {days_held} days, P&L: {pnl_pct:.2f}%, Stop: {self.trailing_stop_price:.2f}")
+        if self.peak_value > 0:
+            self.strategy_drawdown = (self.peak_value - current_value) / self.peak_value
+            # Charted at the same rate as the OnData series
+            if self._bar_ix % self._plot_every == 0:
+                self.Plot("Strategy State", "DrawdownPct", self.strategy_drawdown * 100)
+        
+        if not self.is_invested:
+            return
+            
+        # Log current position status (days held is the trading day count kept by CheckExitSignals)
+        if self._verbose:
+            days_held = self.days_since_entry
+            current_price = self.Securities[self.spy_symbol].Close
+            pnl_pct = (current_price / self.entry_price - 1) * 100 if self.entry_price > 0 else 0
+            self.Log(f"Position update: Holding SPY for {days_held} days, P&L: {pnl_pct:.2f}%, Stop: {self.trailing_stop_price:.2f}")
         
         # Check for time-based reassessment
         if self.days_since_new_high >= 30:
-            self.Log(f"Warning: No new high in {self.days_since_new_high} days")
\ No newline at end of file
+            if self._verbose:
+                self.Log(f"Warning: No new high in {self.days_since_new_high} days")
\ No newline at end of file
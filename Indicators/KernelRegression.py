@@ -1,9 +1,46 @@
 # Indicators/KernelRegression.py
 
 import numpy as np
-from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
 from QuantConnect.Indicators import PythonIndicator, IndicatorDataPoint
 
+try:
+    from Indicators._kr_numba import _kr_value
+except ImportError:
+    # Fallback for when the Indicators directory itself is on the path (see MeanReversionSpyRsiKr imports)
+    from _kr_numba import _kr_value
+
+
+# Gaussian kernel weight tables shared by all KernelRegression instances, keyed by (period, bandwidth)
+_KR_WEIGHT_CACHE = {}
+
+
+def _kr_weights(period, bandwidth):
+    """
+    Gets the Gaussian kernel weights for a window of 'period' points as a (period, period) table,
+    together with their sum.
+    Row 'head' holds the weights in ring buffer order for a buffer whose oldest sample sits at 'head',
+    so row 0 is the plain oldest-first weight vector.
+    The weights only depend on (period, bandwidth), so they are computed once and shared (read-only).
+    """
+    key = (period, bandwidth)
+    entry = _KR_WEIGHT_CACHE.get(key)
+    if entry is None:
+        # K(u) = (1 / sqrt(2 * pi)) * exp(-0.5 * u^2)
+        # u = (x_i - x) / h = (historical_index - current_index) / bandwidth
+        # The constant factor (1/sqrt(2pi)) is omitted as it cancels out in the final weighted average.
+        u = (np.arange(period, dtype=np.float64) - (period - 1)) / bandwidth
+        # Stored as float32 (like the price buffer): plenty for a smoother and half the memory traffic
+        weights = np.exp(-0.5 * u**2).astype(np.float32)
+        # The sample at ring position j is (j - head) % period steps after the oldest one
+        positions = np.arange(period)
+        table = np.ascontiguousarray(weights[(positions[None, :] - positions[:, None]) % period])
+        table.flags.writeable = False
+        entry = (table, np.float32(weights.sum(dtype=np.float64)))
+        _KR_WEIGHT_CACHE[key] = entry
+    return entry
+
+
 class KernelRegression(PythonIndicator):
     """
     Nadaraya-Watson Kernel Regression Indicator using a Gaussian Kernel.
@@ -32,12 +69,24 @@ class KernelRegression(PythonIndicator):
         self.warm_up_period = period
         self.value = 0.0 # Store the current KR value for convenience
 
-        # Use deques to efficiently store historical price data and corresponding indices (time steps)
-        # We store the actual input values (prices)
-        self._window = deque(maxlen=period)
-        # We store a simple sequence of integers representing the time step index
-        self._indices = deque(maxlen=period)
-        self._current_index = 0 # Counter for the time step index
+        # Preallocated ring buffer holding the historical price data (y values).
+        # New samples overwrite the oldest one at '_head', so no per-bar shift is needed.
+        # float32 is enough for a smoothing signal; the reported value is converted back to a Python float.
+        self._buf = np.empty(period, dtype=np.float32)
+        self._head = 0 # Ring buffer position of the oldest sample (and of the next write)
+        self._count = 0 # Number of valid samples currently held in the buffer
+
+        # Calculate weights using Gaussian kernel.
+        # The time distances are the same on every bar (0..period-1 steps back from the current point),
+        # so the weights are computed once rather than on every update. They are tabulated for every
+        # ring position, so each update is a straight dot product of the buffer with row '_head'
+        # and the buffer never has to be unrolled into chronological order.
+        # The denominator sum(weights) is the same constant for every full window, so it is folded too.
+        # It can never be zero: the current point always has weight exp(0) = 1.
+        # Note the numerator cannot be updated incrementally: every sample moves one step further from
+        # the current point on each bar, so all of its (position-dependent) weights change.
+        self._rotated_weights, self._sum_weights = _kr_weights(period, bandwidth)
+        self._weights = self._rotated_weights[0] # Oldest first
 
     @property
     def is_ready(self):
@@ -45,7 +94,7 @@ class KernelRegression(PythonIndicator):
         Gets a flag indicating when this indicator is ready and fully initialized.
         Requires 'period' data points.
         """
-        return len(self._window) == self.period
+        return self._count == self.period
 
     def update(self, input_data):
         """
@@ -55,10 +104,13 @@ class KernelRegression(PythonIndicator):
         Returns:
             bool: True if the indicator is ready after this update, False otherwise.
         """
-        # Add new data point value and its corresponding time step index
-        self._window.append(float(input_data.value))
-        self._indices.append(self._current_index)
-        self._current_index += 1 # Increment time step index
+        # Overwrite the oldest data point with the new value and advance the ring position
+        self._buf[self._head] = float(input_data.value)
+        self._head += 1
+        if self._head == self.period:
+            self._head = 0
+        if self._count < self.period:
+            self._count += 1
 
         # Wait until the window is full before calculating
         if not self.is_ready:
@@ -67,31 +119,8 @@ class KernelRegression(PythonIndicator):
             return False
 
         # --- Kernel Regression Calculation ---
-        # Get the index of the current point (the one we are calculating the regression for)
-        current_index = self._indices[-1]
-        # Convert deques to numpy arrays for vectorized calculations
-        indices_array = np.array(self._indices)
-        window_array = np.array(self._window) # These are the historical prices (y values)
-
-        # Calculate weights using Gaussian kernel
-        # K(u) = (1 / sqrt(2 * pi)) * exp(-0.5 * u^2)
-        # u = (x_i - x) / h = (historical_index - current_index) / bandwidth
-        # We calculate weights for each point in the window relative to the current point.
-        u = (indices_array - current_index) / self.bandwidth
-        # Gaussian kernel calculation. The constant factor (1/sqrt(2pi)) is often omitted
-        # as it cancels out in the final weighted average calculation.
-        weights = np.exp(-0.5 * u**2)
-
-        # Calculate the Nadaraya-Watson estimator (weighted average)
         # KR_value = sum(weights * historical_prices) / sum(weights)
-        sum_weights = np.sum(weights)
-
-        # Avoid division by zero if all weights somehow become zero (highly unlikely with Gaussian kernel and positive bandwidth)
-        if sum_weights > 1e-10: # Use a small threshold for floating point comparison
-            self.value = np.sum(weights * window_array) / sum_weights
-        else:
-            # Fallback: Use the most recent price if weights sum is effectively zero
-            self.value = window_array[-1]
+        self.value = float(_kr_value(self._buf, self._rotated_weights, self._head, self._sum_weights))
 
         # Update the official IndicatorDataPoint value and time
         self.current.value = self.value
@@ -99,13 +128,45 @@ class KernelRegression(PythonIndicator):
 
         return True
 
+    def warmup(self, prices, time):
+        """
+        Primes the indicator with a block of historical prices in a single vectorized pass.
+        Equivalent to calling 'update' once per price, without the per-call overhead.
+        Args:
+            prices (array-like): The historical prices, oldest first.
+            time (datetime): The time of the last price.
+        Returns:
+            numpy.ndarray: The kernel regression value (float32) of every full window inside 'prices', oldest
+            first (empty if there are fewer than 'period' prices). The last one is the indicator's new value.
+        """
+        prices = np.asarray(prices, dtype=np.float32)
+        # All the window values at once: one (windows x period) by (period,) product. Normalizing the
+        # 'period' weights first folds the division into the product instead of a second pass over the values
+        if prices.shape[0] >= self.period:
+            values = sliding_window_view(prices, self.period) @ (self._weights / self._sum_weights)
+        else:
+            values = np.empty(0, dtype=np.float32)
+
+        # Only the last 'period' prices can still be in the window after all the updates
+        n = min(prices.shape[0], self.period)
+        if n > 0:
+            positions = (self._head + np.arange(n)) % self.period
+            self._buf[positions] = prices[prices.shape[0] - n:]
+            self._head = (self._head + n) % self.period
+            self._count = min(self._count + n, self.period)
+        self.current.time = time
+
+        if self.is_ready:
+            self.value = float(_kr_value(self._buf, self._rotated_weights, self._head, self._sum_weights))
+            self.current.value = self.value
+        return values
+
     def reset(self):
         """
         Resets this indicator to its initial state.
         """
-        self._window.clear()
-        self._indices.clear()
-        self._current_index = 0
+        self._head = 0
+        self._count = 0
         self.value = 0.0
         # Reset the base indicator properties
         super().reset()
\ No newline at end of file
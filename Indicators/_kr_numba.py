@@ -0,0 +1,60 @@
+# Indicators/_kr_numba.py
+
+"""
+Numerical kernels for the KernelRegression indicator.
+numba is optional: without it the kernels fall back to NumPy so the indicator still runs.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, types
+    _HAS_NUMBA = True
+    # Eager signature of '_kr_compute': a contiguous float32 ring buffer, the shared (read-only, C-ordered)
+    # float32 weight table, the head position and the weight sum. Compiling it at import removes the first-bar
+    # compilation and the per-call type dispatch
+    _KR_COMPUTE_SIGNATURE = types.float32(
+        types.Array(types.float32, 1, 'C'),
+        types.Array(types.float32, 2, 'C', readonly=True),
+        types.int64,
+        types.float32)
+except ImportError:
+    _HAS_NUMBA = False
+    _KR_COMPUTE_SIGNATURE = None
+    # No-op stand-in for numba.njit, supporting both the bare and the parameterized decorator forms
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(_KR_COMPUTE_SIGNATURE, cache=True, fastmath=True, boundscheck=False)
+def _kr_compute(prices, weight_table, head, sum_weights):
+    """
+    Computes the Nadaraya-Watson estimator sum(w * p) / sum(w) in a single fused loop.
+    Args:
+        prices (np.ndarray): Ring buffer of historical prices (y values).
+        weight_table (np.ndarray): The Gaussian kernel weights for every ring position, see KernelRegression._kr_weights.
+        head (int): Ring buffer position of the oldest sample, selecting the row of 'weight_table'.
+        sum_weights (float): The precomputed sum of the weights.
+    Returns:
+        float: The weighted average.
+    """
+    # The row is indexed inside the compiled loop, so no view object is created per call.
+    # The accumulator is float32 too, so the loop stays in single precision (twice the SIMD lanes)
+    weighted_sum = np.float32(0.0)
+    for j in range(prices.shape[0]):
+        weighted_sum += weight_table[head, j] * prices[j]
+    return weighted_sum / sum_weights
+
+
+def _kr_dot(prices, weight_table, head, sum_weights):
+    """
+    NumPy counterpart of '_kr_compute' used when numba is not installed: the element-wise
+    Python loop would be slow, so the weighted sum is done with a single np.dot call.
+    """
+    return np.dot(weight_table[head], prices) / sum_weights
+
+
+# Kernel used by the indicator: the fused JIT loop when numba is available, a NumPy dot product otherwise
+_kr_value = _kr_compute if _HAS_NUMBA else _kr_dot
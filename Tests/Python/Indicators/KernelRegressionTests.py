@@ -0,0 +1,115 @@
+#
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from clr import AddReference
+AddReference("QuantConnect.Indicators")
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from QuantConnect.Indicators import IndicatorDataPoint
+from datetime import datetime, timedelta
+from unittest import mock
+import numpy as np
+import unittest
+
+import Indicators.KernelRegression as kernel_regression
+from Indicators import _kr_numba
+from Indicators.KernelRegression import KernelRegression
+
+# float32 storage against the float64 computation: ~2.5e-7 relative observed, allow a few float32 ulps more
+FLOAT32_RTOL = 1e-6
+
+def reference_values(prices, period, bandwidth):
+    '''Plain float64 Nadaraya-Watson value of every full window, oldest first (the original implementation)'''
+    u = (np.arange(period, dtype=np.float64) - (period - 1)) / bandwidth
+    weights = np.exp(-0.5 * u**2)
+    return np.array([np.sum(weights * prices[i - period + 1:i + 1]) / np.sum(weights)
+                     for i in range(period - 1, len(prices))])
+
+class KernelRegressionTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.prices = 400 + np.cumsum(rng.normal(size=400))
+        self.start = datetime(2020, 1, 1)
+
+    def kernels(self):
+        '''The kernels the indicator can run with: the NumPy fallback always, the numba one when installed'''
+        kernels = [("numpy", _kr_numba._kr_dot)]
+        if _kr_numba._HAS_NUMBA:
+            kernels.append(("numba", _kr_numba._kr_compute))
+        return kernels
+
+    def point(self, index, price):
+        return IndicatorDataPoint(self.start + timedelta(days=index), float(price))
+
+    def update_all(self, indicator, prices, offset=0):
+        '''Feeds prices bar by bar, returning the values of the bars where the indicator was ready'''
+        values = []
+        for i, price in enumerate(prices):
+            if indicator.update(self.point(offset + i, price)):
+                values.append(indicator.current.value)
+        return values
+
+    def test_MatchesFloat64Reference(self):
+        for name, kernel in self.kernels():
+            for period, bandwidth in [(1, 1.0), (5, 2.5), (80, 15.0)]:
+                with self.subTest(kernel=name, period=period), mock.patch.object(kernel_regression, "_kr_value", kernel):
+                    indicator = KernelRegression("KR", period, bandwidth)
+                    values = self.update_all(indicator, self.prices)
+                    np.testing.assert_allclose(values, reference_values(self.prices, period, bandwidth), rtol=FLOAT32_RTOL)
+                    self.assertIsInstance(indicator.current.value, float)
+
+    def test_WarmUpMatchesBarByBarUpdates(self):
+        period, bandwidth = 80, 15.0
+        end = 300
+        for name, kernel in self.kernels():
+            # split: how many prices both indicators already received one by one before the warm-up block
+            for split in [0, 3, period - 1, 200]:
+                with self.subTest(kernel=name, split=split), mock.patch.object(kernel_regression, "_kr_value", kernel):
+                    stepped = KernelRegression("stepped", period, bandwidth)
+                    warmed = KernelRegression("warmed", period, bandwidth)
+                    self.update_all(stepped, self.prices[:split])
+                    self.update_all(warmed, self.prices[:split])
+
+                    block = self.prices[split:end]
+                    expected = reference_values(block, period, bandwidth)
+                    stepped_values = self.update_all(stepped, block, split)
+                    values = warmed.warmup(block, self.start + timedelta(days=end - 1))
+
+                    # The returned values cover the full windows inside the block only
+                    np.testing.assert_allclose(values, expected, rtol=FLOAT32_RTOL)
+                    self.assertEqual(stepped.is_ready, warmed.is_ready)
+                    self.assertAlmostEqual(stepped.current.value, warmed.current.value, delta=FLOAT32_RTOL * abs(stepped.current.value))
+                    self.assertEqual(stepped_values[-1], stepped.current.value)
+
+                    # Both continue identically after the warm-up
+                    stepped.update(self.point(end, self.prices[end]))
+                    warmed.update(self.point(end, self.prices[end]))
+                    self.assertAlmostEqual(stepped.current.value, warmed.current.value, delta=FLOAT32_RTOL * abs(stepped.current.value))
+
+    def test_WarmUpWithShortBlockIsNotReady(self):
+        indicator = KernelRegression("KR", 80, 15.0)
+        values = indicator.warmup(self.prices[:79], self.start)
+        self.assertEqual(0, len(values))
+        self.assertFalse(indicator.is_ready)
+
+        # One more price completes the window
+        self.assertTrue(indicator.update(self.point(79, self.prices[79])))
+        self.assertAlmostEqual(reference_values(self.prices[:80], 80, 15.0)[0], indicator.current.value, delta=FLOAT32_RTOL * indicator.current.value)
+
+if __name__ == '__main__':
+    unittest.main()
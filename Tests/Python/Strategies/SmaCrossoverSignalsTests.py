@@ -0,0 +1,90 @@
+#
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "project_journal", "strategies")))
+
+import numpy as np
+import unittest
+
+import sma_crossover_signals
+
+def reference_signals(close, fast_len, slow_len):
+    '''Naive per-bar replay of SMA_CrossOver.on_data: buy when fast > slow, sell when fast < slow, else hold'''
+    out = np.zeros(len(close), np.int8)
+    invested = 0
+    for i in range(len(close)):
+        # The SMAs are ready once both windows are full
+        if i >= max(fast_len, slow_len) - 1:
+            fast_value = sum(close[i - fast_len + 1:i + 1]) / fast_len
+            slow_value = sum(close[i - slow_len + 1:i + 1]) / slow_len
+            if not invested and fast_value > slow_value:
+                invested = 1
+            elif invested and fast_value < slow_value:
+                invested = 0
+        out[i] = invested
+    return out
+
+class SmaCrossoverSignalsTests(unittest.TestCase):
+    def implementations(self):
+        '''Every code path: the public entry point (numba when installed), the NumPy fallback and the plain loop'''
+        return [("sma_cross_signals", sma_crossover_signals.sma_cross_signals),
+                ("numpy", sma_crossover_signals._sma_cross_signals_numpy),
+                ("loop", sma_crossover_signals._sma_cross_signals)]
+
+    def assertMatchesReference(self, close, fast_len, slow_len):
+        expected = reference_signals(list(close), fast_len, slow_len)
+        for name, implementation in self.implementations():
+            with self.subTest(implementation=name, fast=fast_len, slow=slow_len, bars=len(close)):
+                actual = implementation(np.asarray(close, dtype=np.float64), fast_len, slow_len)
+                self.assertEqual(np.int8, actual.dtype)
+                np.testing.assert_array_equal(expected, actual)
+
+    def test_MatchesPerBarLogicOnRandomSeries(self):
+        rng = np.random.default_rng(1)
+        for _ in range(30):
+            # Integer prices keep every SMA exact, so exact ties between the averages do happen
+            close = np.round(100 + np.cumsum(rng.normal(size=int(rng.integers(1, 600)))))
+            self.assertMatchesReference(close, int(rng.integers(1, 60)), int(rng.integers(1, 250)))
+
+    def test_HoldsStateOnTies(self):
+        # Rising prices enter, then flat prices make the averages equal: the position is kept, not closed
+        close = [1, 2, 3, 4, 5, 5, 5, 5, 5, 5]
+        self.assertMatchesReference(close, 2, 4)
+        self.assertEqual(1, sma_crossover_signals.sma_cross_signals(close, 2, 4)[-1])
+        # Constant prices never enter
+        self.assertMatchesReference([7] * 20, 3, 5)
+        self.assertEqual(0, sma_crossover_signals.sma_cross_signals([7] * 20, 3, 5).max())
+
+    def test_WarmUpBoundary(self):
+        close = np.arange(1, 21, dtype=np.float64)
+        for fast_len, slow_len in [(3, 8), (8, 3), (5, 5), (1, 1)]:
+            self.assertMatchesReference(close, fast_len, slow_len)
+        # The first signal is on the bar where the longer window fills, not one bar later
+        signals = sma_crossover_signals.sma_cross_signals(close, 3, 8)
+        self.assertEqual(0, signals[:7].max())
+        self.assertEqual(1, signals[7])
+
+    def test_SeriesShorterThanWindows(self):
+        for length in [0, 1, 7]:
+            self.assertMatchesReference(np.arange(length, dtype=np.float64), 3, 8)
+
+    def test_RejectsNonPositivePeriods(self):
+        with self.assertRaises(ValueError):
+            sma_crossover_signals.sma_cross_signals([1.0, 2.0], 0, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,8 +13,17 @@
 
 from AlgorithmImports import *
 
+# Ticker che vengono sottoscritti come indici: servono solo per il segnale, non si possono tradare
+INDEX_TICKERS = {"SPX", "NDX", "DJI", "VIX"}
+
 class SMA_CrossOver(QCAlgorithm):
-    '''Strategia di esempio che utilizza il crossover di due medie mobili semplici (SMA)'''
+    '''Strategia di esempio che utilizza il crossover di due medie mobili semplici (SMA).
+    Il titolo su cui si calcola il segnale e quello negoziato si scelgono con i parametri
+    "signal_symbol" e "trade_symbol" (predefinito: SPY per entrambi)'''
+
+    # Valori predefiniti, ridefinibili dalle sottoclassi
+    default_signal_symbol = "SPY"
+    strategy_name = "SMA CrossOver Strategy"
 
     def initialize(self):
         '''Inizializza i parametri dell'algoritmo, inclusi data range, cash, e asset'''
@@ -26,18 +35,35 @@ class SMA_CrossOver(QCAlgorithm):
         # Imposta il capitale iniziale
         self.set_cash(100000)
         
-        # Aggiungi il titolo da monitorare (SPY - S&P 500 ETF)
-        self.symbol = self.add_equity("SPY", Resolution.DAILY)
+        # Titolo del segnale e titolo negoziato, scelti una volta sola qui
+        signal_ticker = self.get_parameter("signal_symbol", self.default_signal_symbol)
+        trade_ticker = self.get_parameter("trade_symbol", "SPY" if signal_ticker in INDEX_TICKERS else signal_ticker)
+        
+        # Aggiungi il titolo da monitorare (gli indici come SPX solo per il segnale)
+        if signal_ticker in INDEX_TICKERS:
+            self.symbol = self.add_index(signal_ticker, Resolution.DAILY).symbol
+        else:
+            self.symbol = self.add_equity(signal_ticker, Resolution.DAILY).symbol
+        
+        # Se si negozia lo stesso titolo del segnale non serve una seconda sottoscrizione
+        if trade_ticker == signal_ticker:
+            self.trade_symbol = self.symbol
+        else:
+            self.trade_symbol = self.add_equity(trade_ticker, Resolution.DAILY).symbol
+        
+        # Periodi delle medie mobili, sovrascrivibili tramite i parametri dell'algoritmo (vedi config_backtest_spx.json e run_sweep.py)
+        fast_period = self.get_parameter("sma-fast-period", 50)
+        slow_period = self.get_parameter("sma-slow-period", 200)
         
         # Inizializza le medie mobili semplici
-        self.sma_fast = self.SMA(self.symbol, 50)  # Media mobile a 50 giorni
-        self.sma_slow = self.SMA(self.symbol, 200) # Media mobile a 200 giorni
+        self.sma_fast = self.SMA(self.symbol, fast_period)  # Media mobile veloce (default 50 giorni)
+        self.sma_slow = self.SMA(self.symbol, slow_period) # Media mobile lenta (default 200 giorni)
         
         # Imposta il warm-up per gli indicatori
-        self.set_warm_up(200)
+        self.set_warm_up(slow_period)
         
         # Imposta il nome della strategia per i log
-        self.debug(f"SMA CrossOver Strategy inizializzata - {self.symbol}")
+        self.debug(f"{self.strategy_name} inizializzata - segnale {self.symbol}, trading {self.trade_symbol}")
         
         # Traccia gli indicatori
         self.plot_indicator("Indicatori", self.sma_fast, "SMA Fast")
@@ -46,6 +72,10 @@ class SMA_CrossOver(QCAlgorithm):
     def on_data(self, data):
         '''Elabora i dati in arrivo e prende decisioni di trading'''
         
+        # Verifica se abbiamo dati per il titolo del segnale
+        if not data.contains_key(self.symbol):
+            return
+        
         # Verifica se gli indicatori sono pronti
         if not self.sma_fast.is_ready or not self.sma_slow.is_ready:
             return
@@ -58,10 +88,10 @@ class SMA_CrossOver(QCAlgorithm):
         if not self.portfolio.invested:
             # Se non siamo investiti e la media veloce supera quella lenta, compriamo
             if fast_value > slow_value:
-                self.set_holdings(self.symbol, 1)  # Investi il 100% del portafoglio
+                self.set_holdings(self.trade_symbol, 1)  # Investi il 100% del portafoglio
                 self.debug(f"SEGNALE DI ACQUISTO: SMA Fast ({fast_value:.2f}) sopra SMA Slow ({slow_value:.2f})")
         else:
             # Se siamo investiti e la media veloce scende sotto quella lenta, vendiamo
             if fast_value < slow_value:
-                self.liquidate(self.symbol)
+                self.liquidate(self.trade_symbol)
                 self.debug(f"SEGNALE DI VENDITA: SMA Fast ({fast_value:.2f}) sotto SMA Slow ({slow_value:.2f})")
\ No newline at end of file
@@ -12,64 +12,12 @@
 # limitations under the License.
 
 from AlgorithmImports import *
+from esempio_strategia_sma_crossover import SMA_CrossOver
 
-class SMA_CrossOver_SPX(QCAlgorithm):
-    '''Strategia di esempio che utilizza il crossover di due medie mobili semplici (SMA) sull'indice S&P 500'''
+class SMA_CrossOver_SPX(SMA_CrossOver):
+    '''Strategia di esempio che utilizza il crossover di due medie mobili semplici (SMA) sull'indice S&P 500.
+    Il segnale si calcola sull'indice SPX e, poiché l'indice non si può tradare direttamente,
+    si negozia SPY come proxy (entrambi ridefinibili con i parametri "signal_symbol" e "trade_symbol")'''
 
-    def initialize(self):
-        '''Inizializza i parametri dell'algoritmo, inclusi data range, cash, e asset'''
-        
-        # Imposta le date di inizio e fine del backtest
-        self.set_start_date(2018, 1, 1)
-        self.set_end_date(2020, 1, 1)
-        
-        # Imposta il capitale iniziale
-        self.set_cash(100000)
-        
-        # Aggiungi l'indice S&P 500 (SPX)
-        self.symbol = self.add_index("SPX", Resolution.DAILY)
-        
-        # Inizializza le medie mobili semplici
-        self.sma_fast = self.SMA(self.symbol, 50)  # Media mobile a 50 giorni
-        self.sma_slow = self.SMA(self.symbol, 200) # Media mobile a 200 giorni
-        
-        # Imposta il warm-up per gli indicatori
-        self.set_warm_up(200)
-        
-        # Imposta il nome della strategia per i log
-        self.debug(f"SMA CrossOver Strategy su SPX inizializzata - {self.symbol}")
-        
-        # Traccia gli indicatori
-        self.plot_indicator("Indicatori", self.sma_fast, "SMA Fast")
-        self.plot_indicator("Indicatori", self.sma_slow, "SMA Slow")
-        
-        # Poiché SPX è un indice e non possiamo tradarlo direttamente,
-        # utilizzeremo SPY come proxy per il trading
-        self.spy = self.add_equity("SPY", Resolution.DAILY)
-
-    def on_data(self, data):
-        '''Elabora i dati in arrivo e prende decisioni di trading'''
-        
-        # Verifica se gli indicatori sono pronti
-        if not self.sma_fast.is_ready or not self.sma_slow.is_ready:
-            return
-        
-        # Verifica se abbiamo dati per SPX
-        if not data.contains_key(self.symbol):
-            return
-        
-        # Ottieni i valori correnti delle medie mobili
-        fast_value = self.sma_fast.current.value
-        slow_value = self.sma_slow.current.value
-        
-        # Logica di trading (utilizziamo SPY come proxy per tradare l'indice SPX)
-        if not self.portfolio.invested:
-            # Se non siamo investiti e la media veloce supera quella lenta, compriamo SPY
-            if fast_value > slow_value:
-                self.set_holdings(self.spy, 1)  # Investi il 100% del portafoglio in SPY
-                self.debug(f"SEGNALE DI ACQUISTO: SPX SMA Fast ({fast_value:.2f}) sopra SMA Slow ({slow_value:.2f})")
-        else:
-            # Se siamo investiti e la media veloce scende sotto quella lenta, vendiamo SPY
-            if fast_value < slow_value:
-                self.liquidate(self.spy)
-                self.debug(f"SEGNALE DI VENDITA: SPX SMA Fast ({fast_value:.2f}) sotto SMA Slow ({slow_value:.2f})")
\ No newline at end of file
+    default_signal_symbol = "SPX"
+    strategy_name = "SMA CrossOver Strategy su SPX"
\ No newline at end of file
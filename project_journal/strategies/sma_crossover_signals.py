@@ -0,0 +1,96 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean Algorithmic Trading Engine v2.0. Copyright 2014 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''Segnali del crossover SMA calcolati in un solo passaggio su una serie di prezzi, per la ricerca.
+
+Riproduce la logica di SMA_CrossOver (esempio_strategia_sma_crossover.py) senza passare dagli indicatori
+di Lean barra per barra: utile nel QuantBook o negli sweep di parametri che riusano la stessa serie.
+Esempio (QuantBook):
+
+    history = qb.history(qb.add_equity("SPY").symbol, 5000, Resolution.DAILY)
+    stati = sma_cross_signals(history["close"].to_numpy(), 50, 200)
+
+numba è opzionale: senza numba si usa una versione NumPy equivalente.'''
+
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+def _sma_cross_signals(close, fast_len, slow_len):
+    '''Ciclo unico con le somme mobili delle due medie: restituisce 1 (long) / 0 (flat) per ogni barra'''
+    n = close.shape[0]
+    out = np.zeros(n, np.int8)
+    fast_sum = 0.0
+    slow_sum = 0.0
+    state = 0
+    for i in range(n):
+        fast_sum += close[i]
+        if i >= fast_len:
+            fast_sum -= close[i - fast_len]
+        slow_sum += close[i]
+        if i >= slow_len:
+            slow_sum -= close[i - slow_len]
+        # Come in on_data: si entra se la media veloce è sopra la lenta, si esce se è sotto, altrimenti si resta
+        if i >= slow_len - 1 and i >= fast_len - 1:
+            fast_value = fast_sum / fast_len
+            slow_value = slow_sum / slow_len
+            if fast_value > slow_value:
+                state = 1
+            elif fast_value < slow_value:
+                state = 0
+        out[i] = state
+    return out
+
+
+def _sma_cross_signals_numpy(close, fast_len, slow_len):
+    '''Versione NumPy di _sma_cross_signals, usata quando numba non è installato'''
+    n = close.shape[0]
+    out = np.zeros(n, np.int8)
+    warm_up = max(fast_len, slow_len) - 1
+    if n <= warm_up:
+        return out
+    cumsum = np.concatenate(([0.0], np.cumsum(close)))
+    fast = (cumsum[fast_len:] - cumsum[:-fast_len])[warm_up - fast_len + 1:] / fast_len
+    slow = (cumsum[slow_len:] - cumsum[:-slow_len])[warm_up - slow_len + 1:] / slow_len
+    # +1 entra, -1 esce, 0 mantiene lo stato precedente: si propaga l'ultimo cambio di stato
+    change = np.sign(fast - slow)
+    last_change = np.maximum.accumulate(np.where(change != 0, np.arange(change.shape[0]), -1))
+    out[warm_up:] = np.where(last_change >= 0, change[np.maximum(last_change, 0)] > 0, False)
+    return out
+
+
+_sma_cross_signals_jit = njit(cache=True)(_sma_cross_signals) if _HAS_NUMBA else None
+
+
+def sma_cross_signals(close, fast_len, slow_len):
+    '''
+    Calcola lo stato long/flat del crossover SMA per ogni barra.
+    Args:
+        close (array-like): I prezzi di chiusura, dal più vecchio.
+        fast_len (int): Periodo della media mobile veloce.
+        slow_len (int): Periodo della media mobile lenta.
+    Returns:
+        numpy.ndarray: int8, 1 se la strategia è investita alla chiusura della barra, 0 altrimenti
+        (0 anche durante il warm-up delle medie).
+    '''
+    if fast_len < 1 or slow_len < 1:
+        raise ValueError("sma_cross_signals: i periodi devono essere positivi.")
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    if _HAS_NUMBA:
+        return _sma_cross_signals_jit(close, int(fast_len), int(slow_len))
+    return _sma_cross_signals_numpy(close, int(fast_len), int(slow_len))
@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import uuid
+import itertools
+import subprocess
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Runs a parameter grid for one of the Python strategies as independent Lean backtests, one process per grid point.
+# Usage: python run_sweep.py <sweep name> [data path]
+# Requires a Release build of the launcher, same as run_benchmarks.py
+
+launcher_directory = os.path.abspath("./Launcher/bin/Release")
+
+# algorithm type name, algorithm location and the grid of algorithm parameters ("GetParameter" names) per sweep
+sweeps = {
+    "SPYTrendFollowingStrategy": {
+        "algorithm-type-name": "SPYTrendFollowingStrategy",
+        "algorithm-location": "Algorithm.Python/SPYTrendFollowingStrategy.py",
+        "grid": {
+            "fast-ema": [20, 50, 100],
+            "slow-ema": [150, 200],
+            "adx-threshold": [15, 20, 25],
+            "trailing-stop-atr-multiplier": [2.5, 3, 3.5]
+        }
+    },
+    "SMA_CrossOver": {
+        "algorithm-type-name": "SMA_CrossOver",
+        "algorithm-location": "project_journal/strategies/esempio_strategia_sma_crossover.py",
+        "grid": {
+            "sma-fast-period": [20, 50, 100],
+            "sma-slow-period": [150, 200, 250]
+        }
+    },
+    "SMA_CrossOver_SPX": {
+        "algorithm-type-name": "SMA_CrossOver_SPX",
+        "algorithm-location": "project_journal/strategies/esempio_strategia_sma_crossover_spx.py",
+        "grid": {
+            "sma-fast-period": [20, 50, 100],
+            "sma-slow-period": [150, 200, 250]
+        }
+    }
+}
+
+# statistics collected from each backtest result
+statistics = ["Compounding Annual Return", "Sharpe Ratio", "Drawdown", "Net Profit", "Total Orders"]
+
+def parse_statistic(value: str):
+    try:
+        return float(value.replace("%", "").replace("$", "").replace(",", ""))
+    except (AttributeError, ValueError):
+        return None
+
+def run_single_backtest(sweep: dict, parameters: dict, data_path: str, results_root: str):
+    backtest_id = str(uuid.uuid4())
+    # each lean instance gets its own results directory, else they fight for the log and result files
+    results_directory = os.path.join(results_root, backtest_id)
+    os.makedirs(results_directory, exist_ok=True)
+
+    parameter_set = ",".join(f"{key}:{value}" for key, value in sorted(parameters.items()))
+    subprocess.run(["dotnet", "./QuantConnect.Lean.Launcher.dll",
+        "--data-folder", data_path,
+        "--algorithm-language", "Python",
+        "--algorithm-type-name", sweep["algorithm-type-name"],
+        "--algorithm-location", os.path.abspath(sweep["algorithm-location"]),
+        "--algorithm-id", backtest_id,
+        "--results-destination-folder", results_directory,
+        "--parameters", parameter_set,
+        "--log-handler", "ConsoleErrorLogHandler",
+        "--close-automatically", "true"],
+        cwd=launcher_directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True)
+
+    result = json.loads(Path(results_directory, f"{backtest_id}.json").read_text(encoding='utf-8'))
+    result_statistics = result.get("statistics") or result.get("Statistics") or {}
+    return { name: parse_statistic(result_statistics.get(name)) for name in statistics }
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in sweeps:
+        print(f'Usage: python run_sweep.py <{"|".join(sweeps)}> [data path]')
+        sys.exit(1)
+
+    sweep = sweeps[sys.argv[1]]
+    data_path = os.path.abspath(sys.argv[2] if len(sys.argv) > 2 else './Data')
+    results_root = os.path.abspath(os.path.join("sweep_results", sys.argv[1]))
+    print(f'Using data path {data_path}')
+
+    names = list(sweep["grid"])
+    grid = [dict(zip(names, values)) for values in itertools.product(*sweep["grid"].values())]
+    print(f'Running {len(grid)} backtests of {sweep["algorithm-type-name"]} on {os.cpu_count()} workers...')
+
+    rows = []
+    failures = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = { executor.submit(run_single_backtest, sweep, parameters, data_path, results_root): parameters for parameters in grid }
+        for completed, future in enumerate(as_completed(futures), start=1):
+            parameters = futures[future]
+            try:
+                rows.append({ **parameters, **future.result() })
+                print(f'[{completed}/{len(grid)}] {parameters} done')
+            except Exception as error:
+                failures += 1
+                print(f'[{completed}/{len(grid)}] {parameters} failed: {error}')
+
+    if rows:
+        results = pd.DataFrame(rows).sort_values("Sharpe Ratio", ascending=False)
+        results.to_csv(os.path.join(results_root, "sweep_results.csv"), index=False)
+        print(results.to_string(index=False))
+    print(f'Sweep finished: {len(rows)} succeeded, {failures} failed')
+    sys.exit(1 if failures else 0)